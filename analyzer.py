@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from io import StringIO
-from math import dist
 import os
 import tempfile
-from typing import Iterable
+import threading
+import warnings
 
-from Bio.PDB import PDBIO, PDBParser, Superimposer
+from Bio.PDB import PDBParser
+from Bio.PDB.Atom import Atom
+from Bio.PDB.kdtrees import KDTree
+from Bio.PDB.PDBExceptions import PDBConstructionWarning
+from Bio.SVDSuperimposer import SVDSuperimposer
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Optional: without it the NumPy/KD-tree pair search is used.
+    numba = None
 
 
 PROTEIN_RESIDUES = {
@@ -38,8 +49,32 @@ AROMATIC_RESIDUES = {"PHE", "TYR", "TRP", "HIS"}
 POSITIVE_RESIDUES = {"ARG", "LYS", "HIS"}
 NEGATIVE_RESIDUES = {"ASP", "GLU"}
 
+INTERACTION_TYPES = (
+    "hydrogen_bond_like",
+    "salt_bridge_like",
+    "hydrophobic_contact",
+    "aromatic_contact",
+    "close_contact",
+)
+
+# One bit per element of interest; every other element shares OTHER_ELEMENT_BIT, so a pair of
+# atoms is "both polar" exactly when the OR of their bits has no NONPOLAR_BITS set.
+ELEMENT_BITS = {"N": 1, "O": 2, "S": 4, "P": 8, "C": 16}
+OTHER_ELEMENT_BIT = 32
+NONPOLAR_BITS = ELEMENT_BITS["C"] | OTHER_ELEMENT_BIT
+
+RESIDUE_AROMATIC = 1
+RESIDUE_POSITIVE = 2
+RESIDUE_NEGATIVE = 4
+RESNAME_FLAGS = {
+    name: (RESIDUE_AROMATIC if name in AROMATIC_RESIDUES else 0)
+    | (RESIDUE_POSITIVE if name in POSITIVE_RESIDUES else 0)
+    | (RESIDUE_NEGATIVE if name in NEGATIVE_RESIDUES else 0)
+    for name in AROMATIC_RESIDUES | POSITIVE_RESIDUES | NEGATIVE_RESIDUES
+}
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Interaction:
     interaction_type: str
     receptor_chain: str
@@ -64,6 +99,10 @@ class Interaction:
         t, c, n, r = self.signature()
         return f"{t}|{c}|{n}|{r}"
 
+    def as_row(self) -> dict:
+        # Slotted instances have no __dict__; __slots__ lists the fields in declaration order.
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 def _to_int(value, default: int = -1) -> int:
     try:
@@ -101,44 +140,317 @@ def _is_ligand_residue(residue) -> bool:
     return bool(hetflag) and not _is_water_residue(residue)
 
 
-def _is_standard_residue(residue) -> bool:
-    return _is_protein_residue(residue) or _is_ligand_residue(residue)
-
-
-def _residue_label(residue) -> str:
-    return f"{residue.get_parent().id}:{residue.resname.strip()}:{residue.id[1]}"
-
-
 def parse_structure(pdb_text: str):
     parser = PDBParser(QUIET=True)
     return parser.get_structure("complex", StringIO(pdb_text))
 
 
-def _serialize_structure_to_pdb(structure) -> str:
-    out = StringIO()
-    io = PDBIO()
-    io.set_structure(structure)
-    io.save(out)
-    return out.getvalue()
+def _fixed_column(rows: np.ndarray, start: int, stop: int) -> np.ndarray:
+    return np.ascontiguousarray(rows[:, start:stop]).view(f"S{stop - start}").ravel()
+
+
+def _float_column(column: np.ndarray, default: float) -> np.ndarray:
+    try:
+        return column.astype(np.float64)
+    except ValueError:
+        return np.array([_to_float(value, default) for value in column.tolist()], dtype=np.float64)
+
+
+def _assign_elements(fullnames: np.ndarray, elements: np.ndarray) -> np.ndarray:
+    # Defer to Biopython's element inference so blank/unknown element columns resolve exactly as
+    # they do in parse_structure; it only runs once per distinct (atom name, element) combination.
+    combos, inverse = np.unique(np.rec.fromarrays([fullnames, elements]), return_inverse=True)
+    resolved = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", PDBConstructionWarning)
+        for fullname, element in combos.tolist():
+            fullname = fullname.decode()
+            name = fullname.strip() if len(fullname.split()) == 1 else fullname
+            resolved.append(Atom(name, None, 0.0, 1.0, " ", fullname, 0, element.decode()).element)
+    return np.array(resolved, dtype="U2")[inverse.ravel()]
+
+
+def _residue_predicates(resname: np.ndarray, het: np.ndarray) -> dict:
+    """Per-residue predicate columns, mirroring _is_protein_residue and friends.
+
+    They are evaluated once per distinct residue name and broadcast back, so residue selection
+    downstream is plain array indexing.
+    """
+    names, name_idx = np.unique(resname, return_inverse=True)
+    name_idx = name_idx.ravel()
+    names = names.tolist()
+    is_protein = np.array([name in PROTEIN_RESIDUES for name in names], dtype=bool)[name_idx]
+    is_water = np.array([name in WATER_RESIDUES for name in names], dtype=bool)[name_idx]
+    flags = np.array([RESNAME_FLAGS.get(name, 0) for name in names], dtype=np.uint8)[name_idx]
+    return {
+        "res_is_protein": is_protein,
+        "res_is_water": is_water,
+        "res_is_ligand": het & ~is_water,
+        "res_flags": flags,
+    }
 
 
-def _protein_residue_count(chain) -> int:
-    return sum(1 for residue in chain.get_residues() if _is_protein_residue(residue))
+def _pdb_rows(pdb_text: str) -> np.ndarray:
+    """One 80-byte row per line of pdb_text; non-ASCII characters become "?" so columns line up."""
+    lines = np.array(pdb_text.encode("ascii", errors="replace").split(b"\n"), dtype="S80")
+    return lines.view(np.uint8).reshape(-1, 80)
+
+
+def _coordinate_section(record: np.ndarray, opens: np.ndarray) -> tuple[int, int]:
+    """Line range PDBParser reads coordinates from: the first ATOM/HETATM/MODEL up to END/CONECT."""
+    starts = np.flatnonzero(opens)
+    first = int(starts[0]) if len(starts) else len(record)
+    stops = np.flatnonzero((record[first:] == b"END   ") | (record[first:] == b"CONECT"))
+    last = first + int(stops[0]) if len(stops) else len(record)
+    return first, last
+
+
+def _select_residue_variants(
+    resname: np.ndarray, altloc: np.ndarray, residue_of_atom: np.ndarray, residue_first: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Resolve point mutations (one residue id, several residue names) as PDBParser does.
+
+    PDBParser folds the variants into a DisorderedResidue, appended to its chain when the second
+    variant first appears and exposing the variant whose records came last, unless the first
+    variant has atoms without an altloc, in which case it keeps that variant and drops the others.
+    Returns the records to keep, each residue's position in its chain (a record index to sort by)
+    and each residue's first kept record.
+    """
+    keep = np.ones(len(resname), dtype=bool)
+    position = residue_first.copy()
+    first = residue_first.copy()
+    mixed = np.unique(residue_of_atom[resname != resname[residue_first[residue_of_atom]]])
+    if not len(mixed):
+        return keep, position, first
+
+    by_residue = np.argsort(residue_of_atom, kind="stable")
+    bounds = np.searchsorted(residue_of_atom[by_residue], [mixed, mixed + 1])
+    for k, start, stop in zip(mixed.tolist(), *bounds.tolist()):
+        records = by_residue[start:stop]
+        names = resname[records]
+        second = int(np.argmax(names != names[0]))
+        variant = names == names[0]
+        if not np.isin(altloc[records[:second]], [b" ", b""]).any():
+            # PDBParser starts a residue for each run of consecutive records. A run of a new variant
+            # is added and selected; a run of a variant seen before only selects it, and its
+            # records are lost (PDBParser puts them in a residue it then fails to add).
+            position[k] = records[second]
+            run_starts = np.flatnonzero(
+                (np.diff(records, prepend=-2) != 1) | (names != np.roll(names, 1))
+            )
+            run_starts = run_starts[run_starts >= second]
+            seen = {names[0]}
+            selected = names[0]
+            for run_start, run_stop in zip(run_starts.tolist(), [*run_starts[1:].tolist(), len(records)]):
+                selected = names[run_start]
+                if selected in seen:
+                    keep[records[run_start:run_stop]] = False
+                seen.add(selected)
+            variant = names == selected
+        keep[records[~variant]] = False
+        first[k] = records[int(np.argmax(variant & keep[records]))]
+    return keep, position, first
+
+
+def parse_atom_table(pdb_text: str) -> dict:
+    """Parse ATOM/HETATM records straight into per-atom and per-residue NumPy columns.
+
+    This is the input of the heuristic engine, which needs coordinates and a little residue
+    metadata but none of Biopython's object model. Records are sliced by their fixed PDB
+    columns in bulk, and the result follows what PDBParser would build: header lines are
+    skipped, parsing stops at END/CONECT, MODEL/ENDMDL open and close models, chains are
+    ordered by first appearance within a model, residues are grouped by chain, record type,
+    number, insertion code and (for HETATM) name, point-mutation variants resolve to the one
+    PDBParser selects, and alternate locations collapse to the highest-occupancy one (the first
+    on ties).
+
+    Atoms are ordered model, chain, residue, atom, and each residue's atoms are contiguous
+    (res_start[k]:res_start[k + 1]). Coordinates are float32, matching parse_structure. The
+    res_is_* and res_flags columns cache the residue predicates used by the heuristic engine, and
+    chain_id/chain_res_start give the residue range of each chain in each model.
+    """
+    rows = _pdb_rows(pdb_text)
+    record = _fixed_column(rows, 0, 6)
+
+    is_atom = (record == b"ATOM  ") | (record == b"HETATM")
+    is_model = record == b"MODEL "
+    is_endmdl = record == b"ENDMDL"
+    first, last = _coordinate_section(record, is_atom | is_model)
+
+    atom_rows = first + np.flatnonzero(is_atom[first:last])
+    control_rows = first + np.flatnonzero((is_model | is_endmdl)[first:last])
+
+    # Model ids follow PDBParser: every MODEL opens a new model, and atoms seen while no model is
+    # open (no MODEL record at all, or after ENDMDL) implicitly open one.
+    model = np.empty(len(atom_rows), dtype=np.int32)
+    current, next_model, model_open, segment_start = -1, 0, False, 0
+    for row in [*control_rows.tolist(), last]:
+        segment_end = int(np.searchsorted(atom_rows, row))
+        if segment_end > segment_start:
+            if not model_open:
+                current, next_model, model_open = next_model, next_model + 1, True
+            model[segment_start:segment_end] = current
+        segment_start = segment_end
+        if row == last:
+            break
+        if is_model[row]:
+            current, next_model, model_open = next_model, next_model + 1, True
+        else:
+            model_open = False
+
+    rows = rows[atom_rows]
+    het = record[atom_rows] == b"HETATM"
+    fullname = _fixed_column(rows, 12, 16)
+    altloc = _fixed_column(rows, 16, 17)
+    resname = np.char.strip(_fixed_column(rows, 17, 20))
+    chain = _fixed_column(rows, 21, 22)
+    try:
+        resseq = _fixed_column(rows, 22, 26).astype(np.int64)
+        xyz = _fixed_column(rows, 30, 54).view("S8").reshape(-1, 3).astype(np.float64).astype(np.float32)
+    except ValueError as exc:
+        raise ValueError("Invalid residue number or coordinates in ATOM/HETATM records.") from exc
+    icode = _fixed_column(rows, 26, 27)
+    occupancy = _float_column(_fixed_column(rows, 54, 60), 0.0)
+    element = np.char.upper(np.char.strip(_fixed_column(rows, 76, 78)))
+
+    # Residues: group atom records and order them as Structure.get_residues() would. HETATM residue
+    # ids include the residue name, ATOM ones do not: ATOM records that share an id under different
+    # names are point-mutation variants of one residue.
+    residue_keys = np.rec.fromarrays([model, chain, het, resseq, icode, np.where(het, resname, b"")])
+    _, residue_first, residue_of_atom = np.unique(residue_keys, return_index=True, return_inverse=True)
+    residue_of_atom = residue_of_atom.ravel()
+    keep, residue_position, residue_first = _select_residue_variants(
+        resname, altloc, residue_of_atom, residue_first
+    )
+    _, chain_first, chain_of_atom = np.unique(
+        np.rec.fromarrays([model, chain]), return_index=True, return_inverse=True
+    )
+    residue_chain_first = chain_first[chain_of_atom.ravel()[residue_first]]
+    residue_order = np.lexsort((residue_position, residue_chain_first))
+    residue_rank = np.empty_like(residue_order)
+    residue_rank[residue_order] = np.arange(len(residue_order))
+
+    # Atoms: one per (residue, name) among the kept records; alternate locations keep the highest
+    # occupancy.
+    lines = np.flatnonzero(keep)
+    _, group_of_atom = np.unique(
+        np.rec.fromarrays([residue_of_atom[lines], fullname[lines]]), return_inverse=True
+    )
+    group_of_atom = group_of_atom.ravel()
+    line_altloc = altloc[lines]
+    has_altloc = np.bincount(group_of_atom, weights=(line_altloc != b" ") & (line_altloc != b"")) > 0
+    preference = np.where(has_altloc[group_of_atom], np.nan_to_num(occupancy[lines]), 0.0)
+    line_order = np.arange(len(group_of_atom))
+    by_preference = np.lexsort((line_order, -preference, group_of_atom))
+    _, group_start = np.unique(group_of_atom[by_preference], return_index=True)
+    chosen = lines[by_preference[group_start]]
+    group_first = np.full(len(group_start), len(line_order))
+    np.minimum.at(group_first, group_of_atom, line_order)
+    chosen = chosen[np.lexsort((group_first, residue_rank[residue_of_atom[chosen]]))]
+
+    atom_residue = residue_rank[residue_of_atom[chosen]]
+    residue_atoms = residue_first[residue_order]
+    # Residues of one chain within a model are contiguous; record where each such run starts.
+    chain_starts = np.flatnonzero(np.diff(residue_chain_first[residue_order], prepend=-1))
+    chain_res_start = np.append(chain_starts, len(residue_order)).astype(np.intp)
+    res_resname = resname[residue_atoms].astype("U3")
+    res_het = het[residue_atoms]
+    return {
+        "xyz": xyz[chosen],
+        "atom_name": np.char.strip(fullname[chosen]).astype("U4"),
+        "element": _assign_elements(fullname[chosen], element[chosen]),
+        "res_idx": atom_residue.astype(np.intp),
+        "res_start": np.searchsorted(atom_residue, np.arange(len(residue_order) + 1)).astype(np.intp),
+        "res_model": model[residue_atoms],
+        "res_chain": chain[residue_atoms].astype("U1"),
+        "res_het": res_het,
+        "res_resseq": resseq[residue_atoms],
+        "res_icode": icode[residue_atoms].astype("U1"),
+        "res_resname": res_resname,
+        **_residue_predicates(res_resname, res_het),
+        "chain_id": chain[residue_atoms[chain_res_start[:-1]]].astype("U1"),
+        "chain_res_start": chain_res_start,
+    }
 
 
-def _pick_alignment_chain(model, preferred_chain: str | None, exclude_chain: str | None) -> str | None:
-    if preferred_chain:
-        for chain in model.get_chains():
-            if chain.id == preferred_chain and _protein_residue_count(chain) > 0:
-                return chain.id
+# Records tied to the deposited coordinate frame: the unit cell and its fractional (SCALEn) and
+# original (ORIGXn) transforms, non-crystallographic symmetry (MTRIXn), and the crystal symmetry
+# (REMARK 290) and biological assembly (REMARK 350) operators.
+_FRAME_RECORDS = [
+    b"CRYST1",
+    *(f"{name}{k}".encode("ascii") for name in ("SCALE", "ORIGX", "MTRIX") for k in (1, 2, 3)),
+]
+_FRAME_REMARKS = [b" 290", b" 350"]
+
+
+def _transform_pdb_text(pdb_text: str, rotation: np.ndarray, translation: np.ndarray) -> str:
+    """Apply coord @ rotation + translation to every atom PDBParser would read from pdb_text.
+
+    The coordinate columns of those ATOM/HETATM lines are rewritten (as PDBIO formats them) and
+    their ANISOU tensors rotated to match. Records that describe the old frame (_FRAME_RECORDS and
+    _FRAME_REMARKS) are dropped; every other line, headers and CONECT records included, is kept
+    verbatim.
+    """
+    rows = _pdb_rows(pdb_text)
+    record = _fixed_column(rows, 0, 6)
+    is_atom = (record == b"ATOM  ") | (record == b"HETATM")
+    first, last = _coordinate_section(record, is_atom | (record == b"MODEL "))
+    atom_rows = first + np.flatnonzero(is_atom[first:last])
+    try:
+        xyz = _fixed_column(rows[atom_rows], 30, 54).view("S8").reshape(-1, 3).astype(np.float64)
+    except ValueError as exc:
+        raise ValueError("Invalid residue number or coordinates in ATOM/HETATM records.") from exc
+    moved = np.dot(xyz.astype(np.float32), rotation) + translation
+
+    drop = np.isin(record, _FRAME_RECORDS)
+    drop |= (record == b"REMARK") & np.isin(_fixed_column(rows, 6, 10), _FRAME_REMARKS)
+    anisou_rows = first + np.flatnonzero(record[first:last] == b"ANISOU")
+    try:
+        u = _fixed_column(rows[anisou_rows], 28, 70).view("S7").reshape(-1, 6).astype(np.int64)
+    except ValueError:
+        # Unreadable tensors cannot be rotated; leave them out rather than in the old frame.
+        drop[anisou_rows] = True
+        anisou_rows, u = anisou_rows[:0], np.empty((0, 6), dtype=np.int64)
+    # U11 U22 U33 U12 U13 U23 as symmetric matrices. With row-vector coordinates (x' = x R + t) a
+    # tensor transforms as R^T U R.
+    tensors = u[:, [0, 3, 4, 3, 1, 5, 4, 5, 2]].reshape(-1, 3, 3).astype(np.float64)
+    rotated = np.rint(rotation.T @ tensors @ rotation).astype(np.int64)
+    rotated_u = rotated[:, [0, 1, 2, 0, 0, 1], [0, 1, 2, 1, 2, 2]]
+
+    lines = pdb_text.split("\n")
+    for row, (x, y, z) in zip(atom_rows.tolist(), moved.tolist()):
+        line = lines[row]
+        lines[row] = f"{line[:30]}{x:8.3f}{y:8.3f}{z:8.3f}{line[54:]}"
+    for row, values in zip(anisou_rows.tolist(), rotated_u.tolist()):
+        line = lines[row]
+        lines[row] = line[:28] + "".join(f"{v:7d}" for v in values) + line[70:]
+    return "\n".join(line for line, dropped in zip(lines, drop.tolist()) if not dropped)
+
+
+def _first_model_protein_residues(atom_table: dict) -> dict[str, np.ndarray]:
+    """Protein residue indices of each chain of the first model, keyed by chain id."""
+    bounds = atom_table["chain_res_start"]
+    chains: dict[str, np.ndarray] = {}
+    for k, chain_id in enumerate(atom_table["chain_id"].tolist()):
+        start, stop = int(bounds[k]), int(bounds[k + 1])
+        if atom_table["res_model"][start] != 0:
+            break
+        chains[chain_id] = start + np.flatnonzero(atom_table["res_is_protein"][start:stop])
+    return chains
+
+
+def _pick_alignment_chain(
+    protein_residues: dict[str, np.ndarray], preferred_chain: str | None, exclude_chain: str | None
+) -> str | None:
+    if preferred_chain and len(protein_residues.get(preferred_chain, ())) > 0:
+        return preferred_chain
 
     candidates: list[tuple[int, str]] = []
-    for chain in model.get_chains():
-        if exclude_chain and chain.id == exclude_chain:
+    for chain_id, residues in protein_residues.items():
+        if exclude_chain and chain_id == exclude_chain:
             continue
-        count = _protein_residue_count(chain)
-        if count > 0:
-            candidates.append((count, chain.id))
+        if len(residues) > 0:
+            candidates.append((len(residues), chain_id))
 
     if not candidates:
         return None
@@ -146,16 +458,20 @@ def _pick_alignment_chain(model, preferred_chain: str | None, exclude_chain: str
     return candidates[0][1]
 
 
-def _collect_ca_atoms_by_residue(chain) -> dict[tuple[int, str, str], object]:
-    atoms: dict[tuple[int, str, str], object] = {}
-    for residue in chain.get_residues():
-        if not _is_protein_residue(residue):
-            continue
-        if "CA" not in residue:
-            continue
-        key = (residue.id[1], str(residue.id[2]).strip(), residue.resname.strip())
-        atoms[key] = residue["CA"]
-    return atoms
+def _collect_ca_coords_by_residue(
+    atom_table: dict, residues: np.ndarray
+) -> dict[tuple[int, str, str], np.ndarray]:
+    ca = np.flatnonzero(atom_table["atom_name"] == "CA")
+    ca = ca[np.isin(atom_table["res_idx"][ca], residues)]
+    coords: dict[tuple[int, str, str], np.ndarray] = {}
+    for atom, k in zip(ca.tolist(), atom_table["res_idx"][ca].tolist()):
+        key = (
+            int(atom_table["res_resseq"][k]),
+            atom_table["res_icode"][k].strip(),
+            atom_table["res_resname"][k],
+        )
+        coords[key] = atom_table["xyz"][atom]
+    return coords
 
 
 def align_structure_for_compare(
@@ -163,16 +479,28 @@ def align_structure_for_compare(
     pdb_text_moving: str,
     ligand_chain_reference: str | None = None,
     ligand_chain_moving: str | None = None,
+    atom_table_reference: dict | None = None,
+    atom_table_moving: dict | None = None,
 ) -> dict:
-    structure_ref = parse_structure(pdb_text_reference)
-    structure_mov = parse_structure(pdb_text_moving)
-    model_ref = next(structure_ref.get_models(), None)
-    model_mov = next(structure_mov.get_models(), None)
-    if model_ref is None or model_mov is None:
+    """Superpose the moving complex onto the reference by the C-alpha atoms of one protein chain each.
+
+    Chains, C-alpha atoms and the superposition all come from atom tables (parse_atom_table), so
+    already parsed complexes can be passed in instead of being parsed again; the aligned text is
+    pdb_text_moving with its coordinates transformed.
+    """
+    table_ref = atom_table_reference
+    if table_ref is None:
+        table_ref = parse_atom_table(pdb_text_reference)
+    table_mov = atom_table_moving
+    if table_mov is None:
+        table_mov = parse_atom_table(pdb_text_moving)
+    if not len(table_ref["res_model"]) or not len(table_mov["res_model"]):
         return {"aligned_pdb_text": pdb_text_moving, "aligned": False, "reason": "Missing model in input."}
 
-    chain_ref_id = _pick_alignment_chain(model_ref, None, ligand_chain_reference)
-    chain_mov_id = _pick_alignment_chain(model_mov, None, ligand_chain_moving)
+    protein_ref = _first_model_protein_residues(table_ref)
+    protein_mov = _first_model_protein_residues(table_mov)
+    chain_ref_id = _pick_alignment_chain(protein_ref, None, ligand_chain_reference)
+    chain_mov_id = _pick_alignment_chain(protein_mov, None, ligand_chain_moving)
     if not chain_ref_id or not chain_mov_id:
         return {
             "aligned_pdb_text": pdb_text_moving,
@@ -180,10 +508,8 @@ def align_structure_for_compare(
             "reason": "No protein chains available for structural alignment.",
         }
 
-    chain_ref = model_ref[chain_ref_id]
-    chain_mov = model_mov[chain_mov_id]
-    ca_ref = _collect_ca_atoms_by_residue(chain_ref)
-    ca_mov = _collect_ca_atoms_by_residue(chain_mov)
+    ca_ref = _collect_ca_coords_by_residue(table_ref, protein_ref[chain_ref_id])
+    ca_mov = _collect_ca_coords_by_residue(table_mov, protein_mov[chain_mov_id])
 
     common_keys = sorted(set(ca_ref.keys()) & set(ca_mov.keys()))
     if len(common_keys) < 3:
@@ -196,103 +522,288 @@ def align_structure_for_compare(
             "shared_ca_atoms": len(common_keys),
         }
 
-    fixed_atoms = [ca_ref[k] for k in common_keys]
-    moving_atoms = [ca_mov[k] for k in common_keys]
-    sup = Superimposer()
-    sup.set_atoms(fixed_atoms, moving_atoms)
-    sup.apply(structure_mov.get_atoms())
+    # The same computation Bio.PDB.Superimposer runs on Atom objects.
+    sup = SVDSuperimposer()
+    sup.set(
+        np.array([ca_ref[k] for k in common_keys], dtype=np.float64),
+        np.array([ca_mov[k] for k in common_keys], dtype=np.float64),
+    )
+    sup.run()
+    rotation, translation = sup.get_rotran()
 
     return {
-        "aligned_pdb_text": _serialize_structure_to_pdb(structure_mov),
+        "aligned_pdb_text": _transform_pdb_text(pdb_text_moving, rotation, translation),
         "aligned": True,
-        "rmsd": round(float(sup.rms), 4),
+        "rmsd": round(float(sup.get_rms()), 4),
         "reference_chain": chain_ref_id,
         "moving_chain": chain_mov_id,
         "shared_ca_atoms": len(common_keys),
     }
 
 
-def autodetect_ligand(structure) -> tuple[str, str]:
-    ligand_residues = []
-    for residue in structure.get_residues():
-        if _is_ligand_residue(residue):
-            ligand_residues.append(residue)
-
-    if not ligand_residues:
+def autodetect_ligand(atom_table: dict) -> tuple[str, str]:
+    ligand = np.flatnonzero(atom_table["res_is_ligand"])
+    if not len(ligand):
         raise ValueError("No ligand-like HETATM residues found.")
 
+    sizes = np.diff(atom_table["res_start"])[ligand]
     counts: dict[tuple[str, str], int] = {}
-    for residue in ligand_residues:
-        key = (residue.get_parent().id, residue.resname.strip())
-        counts[key] = counts.get(key, 0) + len(list(residue.get_atoms()))
+    for key, size in zip(
+        zip(atom_table["res_chain"][ligand].tolist(), atom_table["res_resname"][ligand].tolist()),
+        sizes.tolist(),
+    ):
+        counts[key] = counts.get(key, 0) + size
 
     ligand_chain, ligand_resname = max(counts, key=counts.get)
     return ligand_chain, ligand_resname
 
 
-def _select_ligand_residues(structure, ligand_resname: str, ligand_chain: str | None = None):
-    matches = []
-    for residue in structure.get_residues():
-        if not _is_ligand_residue(residue):
-            continue
-        if residue.resname.strip() != ligand_resname:
-            continue
-        if ligand_chain and residue.get_parent().id != ligand_chain:
-            continue
-        matches.append(residue)
-    return matches
-
-
-def _select_chain_ligand_residues(structure, ligand_chain: str, ligand_resname: str | None = None):
-    matches = []
-    for residue in structure.get_residues():
-        if residue.get_parent().id != ligand_chain:
-            continue
-        if not _is_standard_residue(residue):
-            continue
-        if _is_water_residue(residue):
-            continue
-        if ligand_resname and residue.resname.strip() != ligand_resname:
-            continue
-        matches.append(residue)
-    return matches
-
-
-def _classify_interaction(receptor_residue, receptor_atom, ligand_atom, d: float) -> str | None:
-    re = (receptor_atom.element or "").upper()
-    le = (ligand_atom.element or "").upper()
-    rr = receptor_residue.resname.strip()
-
-    if d <= 3.5 and {re, le}.issubset({"N", "O", "S", "P"}):
-        return "hydrogen_bond_like"
-
-    if d <= 4.0 and ((rr in POSITIVE_RESIDUES and le == "O") or (rr in NEGATIVE_RESIDUES and le == "N")):
-        return "salt_bridge_like"
-
-    if d <= 4.5 and re == "C" and le == "C":
-        return "hydrophobic_contact"
-
-    if d <= 5.0 and rr in AROMATIC_RESIDUES and le == "C":
-        return "aromatic_contact"
-
-    if d <= 4.0:
-        return "close_contact"
-
-    return None
-
-
-def _iter_receptor_residues(structure, ligand_residues) -> Iterable:
+def _chain_residues(atom_table: dict, ligand_chain: str) -> np.ndarray:
+    """Residue indices of a chain, in every model, read off the per-chain residue ranges."""
+    bounds = atom_table["chain_res_start"]
+    segments = np.flatnonzero(atom_table["chain_id"] == ligand_chain).tolist()
+    if not segments:
+        return np.empty(0, dtype=np.intp)
+    return np.concatenate([np.arange(bounds[k], bounds[k + 1], dtype=np.intp) for k in segments])
+
+
+def _select_ligand_residues(
+    atom_table: dict, ligand_resname: str, ligand_chain: str | None = None
+) -> np.ndarray:
+    if ligand_chain:
+        candidates = _chain_residues(atom_table, ligand_chain)
+        mask = atom_table["res_is_ligand"][candidates]
+        mask &= atom_table["res_resname"][candidates] == ligand_resname
+        return candidates[mask]
+    return np.flatnonzero(atom_table["res_is_ligand"] & (atom_table["res_resname"] == ligand_resname))
+
+
+def _select_chain_ligand_residues(
+    atom_table: dict, ligand_chain: str, ligand_resname: str | None = None
+) -> np.ndarray:
+    candidates = _chain_residues(atom_table, ligand_chain)
+    mask = atom_table["res_is_protein"][candidates] | atom_table["res_is_ligand"][candidates]
+    if ligand_resname:
+        mask &= atom_table["res_resname"][candidates] == ligand_resname
+    return candidates[mask]
+
+
+def _residue_label(atom_table: dict, k: int) -> str:
+    return f"{atom_table['res_chain'][k]}:{atom_table['res_resname'][k]}:{atom_table['res_resseq'][k]}"
+
+
+def _classify_pairs(
+    receptor_elem: np.ndarray,
+    receptor_flags: np.ndarray,
+    ligand_elem: np.ndarray,
+    d: np.ndarray,
+) -> np.ndarray:
+    """Return one INTERACTION_TYPES index per pair, or -1 where the pair is not an interaction.
+
+    Elements are ELEMENT_BITS values and receptor residues RESNAME_FLAGS values, so every rule is
+    a handful of integer mask tests.
+    """
+    n, o, c = ELEMENT_BITS["N"], ELEMENT_BITS["O"], ELEMENT_BITS["C"]
+    ligand_carbon = ligand_elem == c
+    # np.select takes the first matching rule. Carbon-carbon contacts dominate, so they go first;
+    # only the hydrophobic and aromatic rules can both match (aromatic carbon pairs within 4.5 A),
+    # so hydrophobic must stay ahead of aromatic. The polar rules need a non-carbon ligand atom and
+    # are disjoint from both, and close_contact is the fallback.
+    rules = [
+        (INTERACTION_TYPES.index("hydrophobic_contact"), (d <= 4.5) & ligand_carbon & (receptor_elem == c)),
+        (
+            INTERACTION_TYPES.index("aromatic_contact"),
+            (d <= 5.0) & ligand_carbon & ((receptor_flags & RESIDUE_AROMATIC) != 0),
+        ),
+        (
+            INTERACTION_TYPES.index("hydrogen_bond_like"),
+            (d <= 3.5) & (((receptor_elem | ligand_elem) & NONPOLAR_BITS) == 0),
+        ),
+        (
+            INTERACTION_TYPES.index("salt_bridge_like"),
+            (d <= 4.0)
+            & (
+                (((receptor_flags & RESIDUE_POSITIVE) != 0) & (ligand_elem == o))
+                | (((receptor_flags & RESIDUE_NEGATIVE) != 0) & (ligand_elem == n))
+            ),
+        ),
+        (INTERACTION_TYPES.index("close_contact"), d <= 4.0),
+    ]
+    return np.select(
+        [mask for _, mask in rules], [np.int8(code) for code, _ in rules], default=-1
+    ).astype(np.int8)
+
+
+def _receptor_residues(
+    atom_table: dict, ligand_residues: np.ndarray, whole_chain: str | None = None
+) -> np.ndarray:
+    is_protein = atom_table["res_is_protein"]
+    # Chain-as-ligand mode: the ligand is every standard residue of the chain, so a chain id
+    # comparison is the whole exclusion test.
+    if whole_chain:
+        return np.flatnonzero(is_protein & (atom_table["res_chain"] != whole_chain))
+
+    # Only protein ligand residues can collide with receptor residues; for HETATM ligands
+    # this set is empty and the per-residue key test is skipped.
+    chain, resseq, resname = atom_table["res_chain"], atom_table["res_resseq"], atom_table["res_resname"]
     ligand_keys = {
-        (residue.get_parent().id, residue.id[1], residue.resname.strip()) for residue in ligand_residues
+        (chain[k], resseq[k], resname[k]) for k in ligand_residues[is_protein[ligand_residues]].tolist()
+    }
+    receptor = np.flatnonzero(is_protein)
+    if ligand_keys:
+        receptor = receptor[
+            [(chain[k], resseq[k], resname[k]) not in ligand_keys for k in receptor.tolist()]
+        ]
+    return receptor
+
+
+# Above this many receptor x ligand atom pairs a full distance matrix costs more than KD-tree queries.
+_DENSE_PAIR_LIMIT = 4_000_000
+_PAIR_BLOCK = 1024
+
+
+def _close_pairs_dense(receptor_xyz: np.ndarray, ligand_xyz: np.ndarray, cutoff: float):
+    # |r - l|^2 = |r|^2 + |l|^2 - 2 r.l; the small slack absorbs cancellation error so that
+    # pairs sitting exactly on the cutoff still reach the exact distance check downstream.
+    limit = (cutoff + 1e-6) ** 2
+    receptor_sq = np.einsum("ij,ij->i", receptor_xyz, receptor_xyz)
+    ligand_sq = np.einsum("ij,ij->i", ligand_xyz, ligand_xyz)
+    n, m = len(receptor_xyz), len(ligand_xyz)
+
+    # Evaluate in _PAIR_BLOCK x _PAIR_BLOCK tiles so the intermediates stay cache-resident. Each
+    # receptor block fills one boolean row strip, which keeps np.nonzero in receptor-major order.
+    receptor_idx = []
+    ligand_idx = []
+    for i0 in range(0, n, _PAIR_BLOCK):
+        i1 = min(i0 + _PAIR_BLOCK, n)
+        strip = np.empty((i1 - i0, m), dtype=bool)
+        for j0 in range(0, m, _PAIR_BLOCK):
+            j1 = min(j0 + _PAIR_BLOCK, m)
+            d2 = receptor_sq[i0:i1, None] + ligand_sq[None, j0:j1]
+            d2 -= 2.0 * (receptor_xyz[i0:i1] @ ligand_xyz[j0:j1].T)
+            np.less_equal(d2, limit, out=strip[:, j0:j1])
+        rows, cols = np.nonzero(strip)
+        receptor_idx.append(rows + i0)
+        ligand_idx.append(cols)
+    return np.concatenate(receptor_idx), np.concatenate(ligand_idx)
+
+
+def _close_pairs_tree(receptor_xyz: np.ndarray, ligand_xyz: np.ndarray, cutoff: float):
+    # The ligand side is small, so index the receptor once and run one radius query per ligand atom.
+    tree = KDTree(receptor_xyz, 10)
+    receptor_idx: list[int] = []
+    ligand_idx: list[int] = []
+    for j, center in enumerate(ligand_xyz):
+        for point in tree.search(center, cutoff):
+            receptor_idx.append(point.index)
+            ligand_idx.append(j)
+    receptor_idx_arr = np.array(receptor_idx, dtype=np.intp)
+    ligand_idx_arr = np.array(ligand_idx, dtype=np.intp)
+    order = np.lexsort((ligand_idx_arr, receptor_idx_arr))
+    return receptor_idx_arr[order], ligand_idx_arr[order]
+
+
+_numba_kernel_lock = threading.Lock()
+
+if numba is not None:
+
+    # The explicit signature compiles the kernel when the module is imported instead of on the first
+    # call, so the gunicorn arbiter (when_ready) pays for it once before forking the workers.
+    @numba.njit(
+        "Tuple((int64[::1], int64[::1]))(float64[:, :], float64[:, :], float64)", parallel=True, cache=True
+    )
+    def _close_pairs_numba(receptor_xyz, ligand_xyz, limit):
+        # Two passes over receptor atoms in parallel: count each atom's close ligand atoms, then
+        # write the pairs at the prefix-sum offsets, which yields receptor-major order directly.
+        n = receptor_xyz.shape[0]
+        m = ligand_xyz.shape[0]
+        counts = np.zeros(n + 1, dtype=np.int64)
+        for i in numba.prange(n):
+            found = 0
+            for j in range(m):
+                dx = receptor_xyz[i, 0] - ligand_xyz[j, 0]
+                dy = receptor_xyz[i, 1] - ligand_xyz[j, 1]
+                dz = receptor_xyz[i, 2] - ligand_xyz[j, 2]
+                if dx * dx + dy * dy + dz * dz <= limit:
+                    found += 1
+            counts[i + 1] = found
+        offsets = np.cumsum(counts)
+
+        receptor_idx = np.empty(offsets[n], dtype=np.int64)
+        ligand_idx = np.empty(offsets[n], dtype=np.int64)
+        for i in numba.prange(n):
+            k = offsets[i]
+            for j in range(m):
+                dx = receptor_xyz[i, 0] - ligand_xyz[j, 0]
+                dy = receptor_xyz[i, 1] - ligand_xyz[j, 1]
+                dz = receptor_xyz[i, 2] - ligand_xyz[j, 2]
+                if dx * dx + dy * dy + dz * dz <= limit:
+                    receptor_idx[k] = i
+                    ligand_idx[k] = j
+                    k += 1
+        return receptor_idx, ligand_idx
+
+
+def _close_atom_pairs(
+    receptor_xyz: np.ndarray, ligand_xyz: np.ndarray, cutoff: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return receptor and ligand index arrays of pairs within cutoff, in receptor-major order."""
+    if not len(receptor_xyz) or not len(ligand_xyz):
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    # Numba's fallback workqueue threading layer aborts the process when two threads enter a
+    # parallel region at once (compare runs two detections side by side, and request threads may
+    # analyze in-process), so only one caller at a time runs the kernel and the rest use NumPy.
+    if numba is not None and _numba_kernel_lock.acquire(blocking=False):
+        try:
+            # Same slack as the dense path; the caller settles candidates on exact distances.
+            receptor_idx, ligand_idx = _close_pairs_numba(receptor_xyz, ligand_xyz, (cutoff + 1e-6) ** 2)
+        finally:
+            _numba_kernel_lock.release()
+        return receptor_idx.astype(np.intp, copy=False), ligand_idx.astype(np.intp, copy=False)
+    if len(receptor_xyz) * len(ligand_xyz) <= _DENSE_PAIR_LIMIT:
+        return _close_pairs_dense(receptor_xyz, ligand_xyz, cutoff)
+    return _close_pairs_tree(receptor_xyz, ligand_xyz, cutoff)
+
+
+def _atom_columns(atom_table: dict, residues: np.ndarray) -> dict:
+    """Gather the atoms of the given residues; residue metadata is stored once per residue."""
+    begins = atom_table["res_start"][residues]
+    lengths = atom_table["res_start"][residues + 1] - begins
+    # Every residue's atoms are contiguous, so the gather index is a run of aranges.
+    offsets = np.repeat(begins - (np.cumsum(lengths) - lengths), lengths)
+    atom_idx = offsets + np.arange(len(offsets))
+
+    elements, element_idx = np.unique(atom_table["element"][atom_idx], return_inverse=True)
+    element_bits = np.array(
+        [ELEMENT_BITS.get(e, OTHER_ELEMENT_BIT) for e in elements.tolist()], dtype=np.uint8
+    )
+    return {
+        "xyz": atom_table["xyz"][atom_idx].astype("d"),
+        "res_idx": np.repeat(np.arange(len(residues), dtype=np.intp), lengths),
+        "elem": element_bits[element_idx.ravel()],
+        "atom_names": atom_table["atom_name"][atom_idx],
+        "res_flags": atom_table["res_flags"][residues],
+        "res_chain": atom_table["res_chain"][residues],
+        "res_resseq": atom_table["res_resseq"][residues],
+        "residues": [
+            {"chain": chain, "resname": resname, "resseq": resseq}
+            for chain, resname, resseq in zip(
+                atom_table["res_chain"][residues].tolist(),
+                atom_table["res_resname"][residues].tolist(),
+                atom_table["res_resseq"][residues].tolist(),
+            )
+        ],
     }
 
-    for residue in structure.get_residues():
-        if not _is_protein_residue(residue):
-            continue
-        key = (residue.get_parent().id, residue.id[1], residue.resname.strip())
-        if key in ligand_keys:
-            continue
-        yield residue
+
+def _extract_soa(
+    atom_table: dict, ligand_residues: np.ndarray, whole_chain: str | None = None
+) -> tuple[dict, dict]:
+    """Gather receptor and ligand atom columns from the parsed atom table."""
+    receptor = _atom_columns(atom_table, _receptor_residues(atom_table, ligand_residues, whole_chain))
+    ligand = _atom_columns(atom_table, ligand_residues)
+    return receptor, ligand
 
 
 def _count_plip_interactions(interaction_set) -> int:
@@ -429,7 +940,7 @@ def _detect_interactions_plip(
                 "residues": [selected_key],
             },
             "interaction_count": len(interactions),
-            "interactions": [i.__dict__ for i in interactions],
+            "interactions": [i.as_row() for i in interactions],
             "engine_used": "plip",
             "warnings": [],
         }
@@ -439,74 +950,123 @@ def _detect_interactions_plip(
 
 
 def _detect_interactions_heuristic(
-    pdb_text: str,
+    atom_table: dict,
     ligand_resname: str | None = None,
     ligand_chain: str | None = None,
     cutoff: float = 5.0,
 ) -> dict:
-    structure = parse_structure(pdb_text)
-
     # If chain is provided and residue name is omitted, treat the entire chain as ligand.
+    whole_chain = None
     if ligand_chain and not ligand_resname:
-        ligand_residues = _select_chain_ligand_residues(structure, ligand_chain)
+        ligand_residues = _select_chain_ligand_residues(atom_table, ligand_chain)
         ligand_resname = "CHAIN"
+        whole_chain = ligand_chain
     else:
         if not ligand_resname:
-            ligand_chain, ligand_resname = autodetect_ligand(structure)
+            ligand_chain, ligand_resname = autodetect_ligand(atom_table)
         if ligand_chain:
-            ligand_residues = _select_chain_ligand_residues(structure, ligand_chain, ligand_resname)
+            ligand_residues = _select_chain_ligand_residues(atom_table, ligand_chain, ligand_resname)
         else:
-            ligand_residues = _select_ligand_residues(structure, ligand_resname, ligand_chain)
+            ligand_residues = _select_ligand_residues(atom_table, ligand_resname, ligand_chain)
 
-    if not ligand_residues:
+    if not len(ligand_residues):
         chain_info = f" on chain {ligand_chain}" if ligand_chain else ""
         raise ValueError(f"Ligand '{ligand_resname}'{chain_info} was not found.")
 
+    receptor, ligand = _extract_soa(atom_table, ligand_residues, whole_chain)
+    receptor_idx, ligand_idx = _close_atom_pairs(receptor["xyz"], ligand["xyz"], cutoff)
+    # Settle the candidates on exact squared distances and take square roots only for survivors.
+    delta = receptor["xyz"][receptor_idx] - ligand["xyz"][ligand_idx]
+    d2 = np.einsum("ij,ij->i", delta, delta)
+    within = d2 <= cutoff * cutoff
+    receptor_idx, ligand_idx = receptor_idx[within], ligand_idx[within]
+    distances = np.sqrt(d2[within])
+
+    receptor_res_idx = receptor["res_idx"][receptor_idx]
+    ligand_res_idx = ligand["res_idx"][ligand_idx]
+
+    codes = _classify_pairs(
+        receptor["elem"][receptor_idx],
+        receptor["res_flags"][receptor_res_idx],
+        ligand["elem"][ligand_idx],
+        distances,
+    )
+    keep = codes >= 0
+    receptor_idx, ligand_idx, codes = receptor_idx[keep], ligand_idx[keep], codes[keep]
+    receptor_res_idx, ligand_res_idx = receptor_res_idx[keep], ligand_res_idx[keep]
+    # Round with Python's correctly rounded round() rather than np.round, so the sort key is
+    # exactly the reported distance.
+    distances = np.array([round(d, 3) for d in distances[keep].tolist()], dtype=np.float64)
+    receptor_atoms = receptor["atom_names"][receptor_idx]
+
+    # Order by (distance, receptor chain, receptor resseq, receptor atom); lexsort takes the
+    # primary key last and is stable, so ties keep receptor-major pair order.
+    order = np.lexsort(
+        (
+            receptor_atoms,
+            receptor["res_resseq"][receptor_res_idx],
+            receptor["res_chain"][receptor_res_idx],
+            distances,
+        )
+    )
+
     interactions: list[Interaction] = []
 
-    for receptor_residue in _iter_receptor_residues(structure, ligand_residues):
-        for receptor_atom in receptor_residue.get_atoms():
-            rc = receptor_atom.coord
-            for ligand_residue in ligand_residues:
-                for ligand_atom in ligand_residue.get_atoms():
-                    d = dist(rc, ligand_atom.coord)
-                    if d > cutoff:
-                        continue
-
-                    interaction_type = _classify_interaction(receptor_residue, receptor_atom, ligand_atom, d)
-                    if not interaction_type:
-                        continue
-
-                    interactions.append(
-                        Interaction(
-                            interaction_type=interaction_type,
-                            receptor_chain=receptor_residue.get_parent().id,
-                            receptor_resname=receptor_residue.resname.strip(),
-                            receptor_resseq=receptor_residue.id[1],
-                            receptor_atom=receptor_atom.name.strip(),
-                            ligand_chain=ligand_residue.get_parent().id,
-                            ligand_resname=ligand_residue.resname.strip(),
-                            ligand_resseq=ligand_residue.id[1],
-                            ligand_atom=ligand_atom.name.strip(),
-                            distance=round(d, 3),
-                        )
-                    )
-
-    interactions.sort(key=lambda x: (x.distance, x.receptor_chain, x.receptor_resseq, x.receptor_atom))
+    for receptor_atom, ligand_atom, ri, li, d, code in zip(
+        receptor_atoms[order].tolist(),
+        ligand["atom_names"][ligand_idx[order]].tolist(),
+        receptor_res_idx[order].tolist(),
+        ligand_res_idx[order].tolist(),
+        distances[order].tolist(),
+        codes[order].tolist(),
+    ):
+        receptor_meta = receptor["residues"][ri]
+        ligand_meta = ligand["residues"][li]
+        interactions.append(
+            Interaction(
+                interaction_type=INTERACTION_TYPES[code],
+                receptor_chain=receptor_meta["chain"],
+                receptor_resname=receptor_meta["resname"],
+                receptor_resseq=receptor_meta["resseq"],
+                receptor_atom=receptor_atom,
+                ligand_chain=ligand_meta["chain"],
+                ligand_resname=ligand_meta["resname"],
+                ligand_resseq=ligand_meta["resseq"],
+                ligand_atom=ligand_atom,
+                distance=d,
+            )
+        )
 
     return {
         "ligand": {
             "name": ligand_resname,
             "chain": ligand_chain,
-            "residues": [_residue_label(r) for r in ligand_residues],
+            "residues": [_residue_label(atom_table, k) for k in ligand_residues.tolist()],
         },
         "interaction_count": len(interactions),
-        "interactions": [i.__dict__ for i in interactions],
+        "interactions": [i.as_row() for i in interactions],
         "engine_used": "heuristic",
         "warnings": [],
     }
 
 
+def _examples_by_signature(interactions: list[dict]) -> dict[tuple[str, str, int, str], dict]:
+    # Keep one representative full interaction per signature so the UI can highlight
+    # receptor/ligand atoms in each viewer while compare lists remain signature-level.
+    examples: dict[tuple[str, str, int, str], dict] = {}
+    for row in interactions:
+        examples.setdefault(
+            (row["interaction_type"], row["receptor_chain"], row["receptor_resseq"], row["receptor_resname"]),
+            row,
+        )
+    return examples
+
+
+def _signature_key(signature: tuple[str, str, int, str]) -> str:
+    t, c, n, r = signature
+    return f"{t}|{c}|{n}|{r}"
+
+
 def compare_interaction_patterns(
     pdb_text_1: str,
     ligand_resname_1: str | None,
@@ -515,16 +1075,35 @@ def compare_interaction_patterns(
     ligand_resname_2: str | None,
     ligand_chain_2: str | None,
     engine: str = "auto",
+    atom_table_1: dict | None = None,
+    atom_table_2: dict | None = None,
 ) -> dict:
-    result_1 = detect_interactions(pdb_text_1, ligand_resname_1, ligand_chain_1, engine=engine)
-    result_2 = detect_interactions(pdb_text_2, ligand_resname_2, ligand_chain_2, engine=engine)
-
-    interactions_1 = [Interaction(**x) for x in result_1["interactions"]]
-    interactions_2 = [Interaction(**x) for x in result_2["interactions"]]
+    # The two analyses are independent and spend most of their time in NumPy, which releases the GIL.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future_1 = executor.submit(
+            detect_interactions,
+            pdb_text_1,
+            ligand_resname_1,
+            ligand_chain_1,
+            engine=engine,
+            atom_table=atom_table_1,
+        )
+        future_2 = executor.submit(
+            detect_interactions,
+            pdb_text_2,
+            ligand_resname_2,
+            ligand_chain_2,
+            engine=engine,
+            atom_table=atom_table_2,
+        )
+        result_1, result_2 = future_1.result(), future_2.result()
 
-    set_1 = {i.signature() for i in interactions_1}
-    set_2 = {i.signature() for i in interactions_2}
+    examples_1 = _examples_by_signature(result_1["interactions"])
+    examples_2 = _examples_by_signature(result_2["interactions"])
 
+    set_1, set_2 = examples_1.keys(), examples_2.keys()
+    # Plain set algebra on the signature tuples. Packing them into int64 keys for NumPy's sorted-array
+    # routines measured slower at every size: the packing and unpacking run in Python.
     only_1 = sorted(set_1 - set_2)
     only_2 = sorted(set_2 - set_1)
     shared = sorted(set_1 & set_2)
@@ -536,24 +1115,11 @@ def compare_interaction_patterns(
                 "receptor_chain": i[1],
                 "receptor_resseq": i[2],
                 "receptor_resname": i[3],
-                "signature_key": f"{i[0]}|{i[1]}|{i[2]}|{i[3]}",
+                "signature_key": _signature_key(i),
             }
             for i in items
         ]
 
-    # Keep one representative full interaction per signature so the UI can highlight
-    # receptor/ligand atoms in each viewer while compare lists remain signature-level.
-    examples_1: dict[str, dict] = {}
-    examples_2: dict[str, dict] = {}
-    for interaction in interactions_1:
-        key = interaction.signature_key()
-        if key not in examples_1:
-            examples_1[key] = interaction.__dict__
-    for interaction in interactions_2:
-        key = interaction.signature_key()
-        if key not in examples_2:
-            examples_2[key] = interaction.__dict__
-
     return {
         "complex_1": {
             "ligand": result_1["ligand"],
@@ -570,8 +1136,8 @@ def compare_interaction_patterns(
         "shared": _to_rows(shared),
         "only_in_complex_1": _to_rows(only_1),
         "only_in_complex_2": _to_rows(only_2),
-        "example_interactions_complex_1": examples_1,
-        "example_interactions_complex_2": examples_2,
+        "example_interactions_complex_1": {_signature_key(sig): row for sig, row in examples_1.items()},
+        "example_interactions_complex_2": {_signature_key(sig): row for sig, row in examples_2.items()},
     }
 
 
@@ -581,23 +1147,30 @@ def detect_interactions(
     ligand_chain: str | None = None,
     cutoff: float = 5.0,
     engine: str = "auto",
+    atom_table: dict | None = None,
 ) -> dict:
     mode = (engine or "auto").lower()
     if mode not in {"auto", "plip", "heuristic"}:
         raise ValueError("Invalid engine. Use one of: auto, plip, heuristic.")
 
+    def _run_heuristic() -> dict:
+        # The heuristic engine works on parse_atom_table columns; PLIP still reads the raw text.
+        # Callers that already hold a parsed table pass it in to skip a second parse.
+        parsed = atom_table if atom_table is not None else parse_atom_table(pdb_text)
+        return _detect_interactions_heuristic(
+            parsed,
+            ligand_resname=ligand_resname,
+            ligand_chain=ligand_chain,
+            cutoff=cutoff,
+        )
+
     # PLIP is primarily small-molecule focused. For chain-as-ligand mode, default to heuristic.
     if ligand_chain and not ligand_resname:
         if mode == "plip":
             raise ValueError(
                 "PLIP mode is not supported for chain-as-ligand selection. Use engine=heuristic or auto."
             )
-        heuristic = _detect_interactions_heuristic(
-            pdb_text=pdb_text,
-            ligand_resname=ligand_resname,
-            ligand_chain=ligand_chain,
-            cutoff=cutoff,
-        )
+        heuristic = _run_heuristic()
         if mode == "auto":
             heuristic["warnings"] = [
                 "Chain-as-ligand selection detected; using heuristic engine (PLIP is small-molecule focused).",
@@ -614,27 +1187,18 @@ def detect_interactions(
                 raise ValueError(
                     "PLIP engine requested but not available. Install PLIP and OpenBabel dependencies."
                 )
-            heuristic = _detect_interactions_heuristic(
-                pdb_text=pdb_text,
-                ligand_resname=ligand_resname,
-                ligand_chain=ligand_chain,
-                cutoff=cutoff,
-            )
+            heuristic = _run_heuristic()
             heuristic["warnings"] = [
                 "PLIP not available; using heuristic interaction model instead.",
             ]
             return heuristic
 
-    return _detect_interactions_heuristic(
-        pdb_text=pdb_text,
-        ligand_resname=ligand_resname,
-        ligand_chain=ligand_chain,
-        cutoff=cutoff,
-    )
+    return _run_heuristic()
 
 
-def inspect_pdb_entities(pdb_text: str) -> dict:
-    structure = parse_structure(pdb_text)
+def inspect_pdb_entities(pdb_text: str, structure=None) -> dict:
+    if structure is None:
+        structure = parse_structure(pdb_text)
     model = next(structure.get_models(), None)
     if model is None:
         raise ValueError("No model found in PDB file.")
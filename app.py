@@ -1,21 +1,158 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cache, partial
+import base64
+import codecs
+import gzip
+import hashlib
+import http.client
+import io
+import multiprocessing
+import os
 from pathlib import Path
-import re
-from urllib.error import URLError
-from urllib.request import urlopen
+import ssl
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
 
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, render_template, request
+import orjson
+from werkzeug.datastructures import MultiDict
+
+try:
+    import brotli
+except ImportError:  # Optional: without it responses are gzip-compressed only.
+    brotli = None
 
-from analyzer import (
-    align_structure_for_compare,
-    compare_interaction_patterns,
-    detect_interactions,
-    inspect_pdb_entities,
-)
 
 app = Flask(__name__)
 app.config["MAX_CONTENT_LENGTH"] = 8 * 1024 * 1024  # 8MB
+UPLOAD_CHUNK_SIZE = 256 * 1024
+ALLOWED_UPLOAD_EXTENSIONS = {".pdb", ".ent", ".txt"}
+FORM_MIMETYPES = {"multipart/form-data", "application/x-www-form-urlencoded"}
+ANALYSIS_TAG_HEADER = "X-Analysis-Tag"
+# Response compression: JSON results and PDB texts (mostly repeated ASCII columns) shrink several
+# fold; bodies under COMPRESS_MIN_SIZE are sent as-is.
+app.config["COMPRESS_MIMETYPES"] = {"application/json", "chemical/x-pdb"}
+app.config["COMPRESS_MIN_SIZE"] = 2048
+app.config["COMPRESS_LEVEL"] = 4
+# Worker processes for interaction analysis, which holds the GIL for much of its run; request
+# threads only wait on the result. 0 runs the analysis in the request thread instead, which is what
+# gunicorn.conf.py sets: its workers already occupy every core.
+app.config["ANALYSIS_PROCESSES"] = int(os.environ.get("ANALYSIS_PROCESSES", os.cpu_count() or 1))
+# Engines that may run the heuristic detector, the only consumer of the parsed atom tables.
+HEURISTIC_ENGINES = {"auto", "heuristic"}
+
+# Parse results (Biopython structures and heuristic atom tables) for recently seen PDB texts, keyed
+# by content digest and parser. The UI inspects a file before analyzing it and users often re-run
+# with a different ligand, so hits are common. Cached entries are shared between requests and must
+# be treated as read-only. The cache (one per process) is bounded by approximate memory, estimated
+# from the text length: a Biopython structure takes about 14 times the size of its text, an atom
+# table less than the text.
+STRUCTURE_CACHE_BYTES = 256 * 1024 * 1024
+PARSED_SIZE_FACTORS = {"parse_structure": 14, "parse_atom_table": 1}
+_structure_cache: OrderedDict[tuple[str, str], tuple[object, int]] = OrderedDict()
+_structure_cache_bytes = 0
+_structure_cache_lock = threading.Lock()
+
+# Downloaded RCSB files by PDB ID. Popular entries are requested again and again, and a compare
+# may name the same ID on both sides; entries expire so upstream revisions are picked up. Bounded by
+# the total length of the cached texts.
+PDB_DOWNLOAD_CACHE_BYTES = 64 * 1024 * 1024
+PDB_DOWNLOAD_TTL_SECONDS = 3600
+_download_cache: OrderedDict[str, tuple[float, str, str]] = OrderedDict()
+_download_cache_bytes = 0
+_download_cache_lock = threading.Lock()
+
+RCSB_HOST = "files.rcsb.org"
+RCSB_TIMEOUT_SECONDS = 20
+_rcsb_local = threading.local()
+# The most recent RCSB TLS session. Connections opened later (by other threads, or after the server
+# dropped an idle one) resume it and skip the full handshake.
+_rcsb_tls_session: ssl.SSLSession | None = None
+
+# PDB texts handed back to the viewer through /api/pdb/<ref>. JSON responses carry the short
+# content digest instead of embedding megabytes of escaped PDB text. The texts are files named by
+# digest in a directory every server process can read, since the viewer's follow-up GET may reach
+# a different worker than the analysis did; files unused for PDB_TEXT_TTL_SECONDS are removed.
+app.config["PDB_TEXT_DIR"] = os.environ.get("PDB_TEXT_DIR", os.path.join(app.instance_path, "pdb"))
+PDB_TEXT_TTL_SECONDS = 24 * 3600
+PDB_TEXT_PRUNE_INTERVAL_SECONDS = 600
+_pdb_text_pruned_at = 0.0
+
+# Shared worker threads for per-request I/O (RCSB downloads) and parsing that can overlap.
+_io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="complex-io")
+
+_analysis_pool: ProcessPoolExecutor | None = None
+_analysis_pool_lock = threading.Lock()
+
+
+@cache
+def _analyzer():
+    # Biopython and NumPy account for most of the app's import time. Importing the analyzer on first
+    # use lets the web process and the dev reloader come up quickly; gunicorn.conf.py imports it
+    # ahead of forking so preforked workers still share it.
+    import analyzer
+
+    return analyzer
+
+
+def _json_response(payload: dict, status: int = 200):
+    # orjson encodes in C and emits bytes directly, which matters for responses that carry whole PDB texts.
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype="application/json",
+    )
+
+
+@app.after_request
+def _compress_response(response):
+    if response.direct_passthrough or response.mimetype not in app.config["COMPRESS_MIMETYPES"]:
+        return response
+    if "Content-Encoding" in response.headers:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if brotli is not None and request.accept_encodings["br"] > 0:
+        encoding = "br"
+    elif request.accept_encodings["gzip"] > 0:
+        encoding = "gzip"
+    else:
+        return response
+    body = response.get_data()
+    if len(body) < app.config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    level = app.config["COMPRESS_LEVEL"]
+    if encoding == "br":
+        response.set_data(brotli.compress(body, quality=level))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=level))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+@app.before_request
+def _reject_bad_uploads():
+    # Runs on headers alone, before Flask reads the body: oversized or non-form POSTs are turned
+    # away without buffering up to MAX_CONTENT_LENGTH bytes first.
+    if request.method != "POST":
+        return None
+    max_length = app.config["MAX_CONTENT_LENGTH"]
+    if request.content_length is not None and request.content_length > max_length:
+        return _json_response(
+            {"error": f"Request is too large. The limit is {max_length // (1024 * 1024)} MB."}, 413
+        )
+    if request.mimetype not in FORM_MIMETYPES:
+        return _json_response({"error": "Expected a form submission (multipart/form-data)."}, 415)
+    return None
 
 
 @app.get("/")
@@ -27,84 +164,426 @@ def _normalize_pdb_id(value: str | None) -> str | None:
     if not value:
         return None
     cleaned = value.strip().upper()
-    if not re.fullmatch(r"[A-Z0-9]{4}", cleaned):
+    # Same test as matching [A-Z0-9]{4}: after upper(), four ASCII alphanumerics are exactly that.
+    if not (len(cleaned) == 4 and cleaned.isascii() and cleaned.isalnum()):
         raise ValueError(f"Invalid PDB code '{value}'. Expected 4 alphanumeric characters.")
     return cleaned
 
 
-def _download_pdb_by_id(pdb_id: str) -> str:
-    url = f"https://files.rcsb.org/download/{pdb_id}.pdb"
+@cache
+def _rcsb_ssl_context() -> ssl.SSLContext:
+    # Shared by all RCSB connections: a new default context per connection reloads the CA bundle,
+    # and TLS sessions can only be resumed through the context that created them.
+    return ssl.create_default_context()
+
+
+class _RCSBConnection(http.client.HTTPSConnection):
+    """HTTPS connection that offers the last RCSB TLS session for resumption when it connects."""
+
+    def connect(self):
+        # Opens the TCP connection and, when proxied, the CONNECT tunnel to RCSB.
+        http.client.HTTPConnection.connect(self)
+        self.sock = self._context.wrap_socket(
+            self.sock, server_hostname=self._tunnel_host or self.host, session=_rcsb_tls_session
+        )
+
+
+def _rcsb_connection() -> _RCSBConnection:
+    """New RCSB connection, tunnelled through the HTTPS proxy configured in the environment if any."""
+    proxy = urllib.request.getproxies().get("https")
+    if not proxy or urllib.request.proxy_bypass(RCSB_HOST):
+        return _RCSBConnection(RCSB_HOST, timeout=RCSB_TIMEOUT_SECONDS, context=_rcsb_ssl_context())
+    parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    conn = _RCSBConnection(
+        parts.hostname, parts.port or 80, timeout=RCSB_TIMEOUT_SECONDS, context=_rcsb_ssl_context()
+    )
+    headers = {}
+    if parts.username is not None:
+        credentials = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode("ascii")
+    conn.set_tunnel(RCSB_HOST, headers=headers)
+    return conn
+
+
+def _rcsb_get(path: str) -> bytes:
+    global _rcsb_tls_session
+    # One keep-alive connection per thread: http.client connections are not thread-safe, and reusing
+    # one skips the TCP and TLS handshakes on every download after the first.
+    for attempt in range(2):
+        conn = getattr(_rcsb_local, "conn", None)
+        reused = conn is not None
+        if conn is None:
+            conn = _rcsb_connection()
+            _rcsb_local.conn = conn
+        try:
+            conn.request("GET", path)
+            sock = conn.sock
+            resp = conn.getresponse()
+            data = resp.read()
+            # TLS 1.3 servers send session tickets after the handshake, so read the session only
+            # once the response has arrived.
+            _rcsb_tls_session = sock.session or _rcsb_tls_session
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            _rcsb_local.conn = None
+            # The server may have dropped an idle kept-alive connection; retry once on a fresh one.
+            if attempt or not reused:
+                raise
+            continue
+        if resp.will_close:
+            conn.close()
+            _rcsb_local.conn = None
+        if 300 <= resp.status < 400:
+            # Rare enough that urllib may follow the redirect on a connection of its own.
+            with urllib.request.urlopen(
+                f"https://{RCSB_HOST}{path}", timeout=RCSB_TIMEOUT_SECONDS, context=_rcsb_ssl_context()
+            ) as redirected:
+                return redirected.read()
+        if resp.status != 200:
+            raise http.client.HTTPException(f"RCSB returned HTTP {resp.status} for {path}")
+        return data
+
+
+def _looks_like_pdb(data: bytes, previous: bytes = b"\n") -> bool:
+    """Whether data holds an ATOM/HETATM record, i.e. one starting a line in PDB columns 1-6.
+
+    previous is whatever preceded data (the last chunk, when scanning a stream), so a record split
+    across two chunks is still found; the default treats data as the start of the file.
+    """
+    window = previous[-6:] + data
+    return b"\nATOM  " in window or b"\nHETATM" in window
+
+
+def _download_pdb_by_id(pdb_id: str) -> tuple[str, str]:
+    """Return the PDB text for pdb_id and its digest (_pdb_digest)."""
+    global _download_cache_bytes
+    now = time.monotonic()
+    with _download_cache_lock:
+        cached = _download_cache.get(pdb_id)
+        if cached is not None and now - cached[0] < PDB_DOWNLOAD_TTL_SECONDS:
+            _download_cache.move_to_end(pdb_id)
+            return cached[1], cached[2]
+
     try:
-        with urlopen(url, timeout=20) as resp:
-            raw = resp.read().decode("utf-8", errors="ignore")
-    except URLError as exc:
+        data = _rcsb_get(f"/download/{pdb_id}.pdb")
+    except (OSError, http.client.HTTPException) as exc:
         raise ValueError(f"Could not download PDB '{pdb_id}' from RCSB.") from exc
 
-    if "ATOM" not in raw and "HETATM" not in raw:
+    # Record names are ASCII, so validate on the raw bytes and only decode files that pass. RCSB
+    # serves plain ASCII PDB files, which the ASCII codec decodes without any multi-byte handling.
+    if not _looks_like_pdb(data):
         raise ValueError(f"Downloaded file for '{pdb_id}' did not look like a valid PDB structure.")
-    return raw
+    raw = data.decode("ascii", errors="ignore")
+    digest = _pdb_digest(raw)
+
+    if len(raw) > PDB_DOWNLOAD_CACHE_BYTES:
+        return raw, digest
+    with _download_cache_lock:
+        replaced = _download_cache.pop(pdb_id, None)
+        if replaced is not None:
+            _download_cache_bytes -= len(replaced[1])
+        _download_cache[pdb_id] = (now, raw, digest)
+        _download_cache_bytes += len(raw)
+        while _download_cache_bytes > PDB_DOWNLOAD_CACHE_BYTES:
+            _download_cache_bytes -= len(_download_cache.popitem(last=False)[1][1])
+    return raw, digest
+
+
+def _pdb_digest(pdb_text: str) -> str:
+    return hashlib.blake2b(pdb_text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _analysis_tag(digest: str, source: str, *options: str | None) -> str:
+    """Tag of an analysis result: the structure digest plus every other input of the result."""
+    key = "\0".join([digest, source, *(option or "" for option in options)])
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _pdb_text_path(ref: str) -> str:
+    return os.path.join(app.config["PDB_TEXT_DIR"], f"{ref}.pdb")
 
 
-def _extract_complex_text(file_field_name: str, pdb_id_field_name: str) -> tuple[str, str]:
-    uploaded = request.files.get(file_field_name)
+def _prune_pdb_texts(now: float) -> None:
+    global _pdb_text_pruned_at
+    if now - _pdb_text_pruned_at < PDB_TEXT_PRUNE_INTERVAL_SECONDS:
+        return
+    _pdb_text_pruned_at = now
+    with os.scandir(app.config["PDB_TEXT_DIR"]) as entries:
+        for entry in entries:
+            try:
+                if entry.name.endswith(".pdb") and now - entry.stat().st_mtime > PDB_TEXT_TTL_SECONDS:
+                    os.unlink(entry.path)
+            except FileNotFoundError:  # Removed by another process meanwhile.
+                pass
+
+
+def _pdb_text_dir() -> str:
+    directory = app.config["PDB_TEXT_DIR"]
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    # Served texts are read back from here, so refuse a directory another user created or controls.
+    if hasattr(os, "getuid") and os.stat(directory).st_uid != os.getuid():
+        raise PermissionError(f"PDB_TEXT_DIR {directory} is not owned by the server user.")
+    return directory
+
+
+def _store_pdb_text(pdb_text: str, digest: str | None = None) -> str:
+    ref = digest or _pdb_digest(pdb_text)
+    path = _pdb_text_path(ref)
+    now = time.time()
+    try:
+        # Content-addressed, so an existing file already holds this text; just keep it fresh.
+        os.utime(path, (now, now))
+    except FileNotFoundError:
+        # Write under a temporary name and rename, so readers never see a partial file.
+        handle = tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", newline="", dir=_pdb_text_dir(), suffix=".tmp", delete=False
+        )
+        try:
+            with handle:
+                handle.write(pdb_text)
+            os.replace(handle.name, path)
+        except BaseException:
+            os.unlink(handle.name)
+            raise
+    _prune_pdb_texts(now)
+    return ref
+
+
+def _cached_parse(pdb_text: str, parse, digest: str | None = None):
+    global _structure_cache_bytes
+    key = (digest or _pdb_digest(pdb_text), parse.__name__)
+    with _structure_cache_lock:
+        cached = _structure_cache.get(key)
+        if cached is not None:
+            _structure_cache.move_to_end(key)
+            return cached[0]
+
+    parsed = parse(pdb_text)
+    size = len(pdb_text) * PARSED_SIZE_FACTORS.get(parse.__name__, 1)
+    if size > STRUCTURE_CACHE_BYTES:
+        return parsed
+    with _structure_cache_lock:
+        replaced = _structure_cache.pop(key, None)
+        if replaced is not None:  # Parsed by another request meanwhile.
+            _structure_cache_bytes -= replaced[1]
+        _structure_cache[key] = (parsed, size)
+        _structure_cache_bytes += size
+        while _structure_cache_bytes > STRUCTURE_CACHE_BYTES:
+            _structure_cache_bytes -= _structure_cache.popitem(last=False)[1][1]
+    return parsed
+
+
+def _get_structure(pdb_text: str, digest: str | None = None):
+    return _cached_parse(pdb_text, _analyzer().parse_structure, digest)
+
+
+def _get_atom_table(pdb_text: str, digest: str | None = None) -> dict:
+    return _cached_parse(pdb_text, _analyzer().parse_atom_table, digest)
+
+
+def _field(
+    form: MultiDict, name: str, default: str | None = None, *, upper: bool = False, lower: bool = False
+) -> str | None:
+    """Stripped form value, optionally case-folded; missing or blank values give default."""
+    value = form.get(name)
+    if not value:
+        return default
+    value = value.strip()
+    if upper:
+        value = value.upper()
+    elif lower:
+        value = value.lower()
+    return value or default
+
+
+def _resolve_complex_input(
+    form: MultiDict, files: MultiDict, file_field_name: str, pdb_id_field_name: str
+) -> tuple[Callable[[], tuple[str, str]], str]:
+    """Validate one complex input and return a loader for its PDB text and digest plus a source label.
+
+    The upload is read here, inside the request context. The loader touches neither the form nor
+    the files, so RCSB downloads can run on worker threads.
+    """
+    uploaded = files.get(file_field_name)
     if not uploaded or uploaded.filename == "":
-        pdb_id = _normalize_pdb_id(request.form.get(pdb_id_field_name))
+        pdb_id = _normalize_pdb_id(form.get(pdb_id_field_name))
         if pdb_id:
-            return _download_pdb_by_id(pdb_id), f"pdb:{pdb_id}"
+            return partial(_download_pdb_by_id, pdb_id), f"pdb:{pdb_id}"
         raise ValueError(f"Missing input for '{file_field_name}'. Provide a file or a PDB code.")
 
     filename = uploaded.filename.lower()
-    if not (filename.endswith(".pdb") or filename.endswith(".ent") or filename.endswith(".txt") or "." not in filename):
+    if not (Path(filename).suffix in ALLOWED_UPLOAD_EXTENSIONS or "." not in filename):
         raise ValueError(f"Unsupported file type for '{file_field_name}'. Use .pdb/.ent/.txt")
 
-    return uploaded.read().decode("utf-8", errors="ignore"), f"file:{uploaded.filename}"
+    # Large uploads are spooled to disk by the form parser. Decode them in fixed-size chunks, hashing
+    # each decoded chunk on the way, so neither the raw bytes nor a re-encoded copy of the text is
+    # ever held in full just to compute the cache digest. Line endings are kept exactly as uploaded.
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    hasher = hashlib.blake2b(digest_size=16)
+    buffer = io.StringIO(newline="")
+    previous, looks_like_pdb = b"\n", False
+    for data in iter(partial(uploaded.stream.read, UPLOAD_CHUNK_SIZE), b""):
+        looks_like_pdb = looks_like_pdb or _looks_like_pdb(data, previous)
+        previous = data
+        chunk = decoder.decode(data)
+        hasher.update(chunk.encode("utf-8"))
+        buffer.write(chunk)
+    if not looks_like_pdb:
+        raise ValueError(f"Uploaded file for '{file_field_name}' did not look like a valid PDB structure.")
+    pdb_text = buffer.getvalue()
+    buffer.close()
+    digest = hasher.hexdigest()
+    return lambda: (pdb_text, digest), f"file:{uploaded.filename}"
+
+
+def _load_complex(load: Callable[[], tuple[str, str]], parse_table: bool) -> tuple[str, str, dict | None]:
+    pdb_text, digest = load()
+    return pdb_text, digest, _get_atom_table(pdb_text, digest) if parse_table else None
+
+
+def _submit_analysis(analysis: Callable[[], dict]) -> Future:
+    processes = app.config["ANALYSIS_PROCESSES"]
+    if not processes:
+        future: Future = Future()
+        try:
+            future.set_result(analysis())
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    global _analysis_pool
+    with _analysis_pool_lock:
+        if _analysis_pool is not None:
+            try:
+                return _analysis_pool.submit(analysis)
+            except BrokenProcessPool:
+                # A worker died (out of memory, or a crash in native code such as OpenBabel), which
+                # breaks the whole pool for good; replace it.
+                _analysis_pool.shutdown(wait=False, cancel_futures=True)
+        # Created on first use, so preforked servers start one pool per worker, and spawned rather
+        # than forked so children do not inherit this process's threads and locks.
+        _analysis_pool = ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+        )
+        return _analysis_pool.submit(analysis)
+
+
+def _analysis_result(future: Future, analysis: Callable[[], dict]) -> dict:
+    """Wait for a _submit_analysis future, rerunning the analysis once if its worker process died.
+
+    The rerun goes to a fresh pool; if that fails as well, BrokenProcessPool propagates and the
+    views answer 503.
+    """
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        return _submit_analysis(analysis).result()
+
+
+def _extract_complex_text(
+    form: MultiDict, files: MultiDict, file_field_name: str, pdb_id_field_name: str
+) -> tuple[str, str, str]:
+    load, source = _resolve_complex_input(form, files, file_field_name, pdb_id_field_name)
+    return *load(), source
 
 
 @app.post("/api/analyze")
 def analyze():
     try:
-        pdb_text, source = _extract_complex_text("complex", "pdb_id")
-        ligand_resname = (request.form.get("ligand_resname") or "").strip().upper() or None
-        ligand_chain = (request.form.get("ligand_chain") or "").strip() or None
-        engine = (request.form.get("engine") or "auto").strip().lower() or "auto"
+        form, files = request.form, request.files
+        pdb_text, digest, source = _extract_complex_text(form, files, "complex", "pdb_id")
+        ligand_resname = _field(form, "ligand_resname", upper=True)
+        ligand_chain = _field(form, "ligand_chain")
+        engine = _field(form, "engine", "auto", lower=True)
 
-        result = detect_interactions(pdb_text, ligand_resname, ligand_chain, engine=engine)
-        result["pdb"] = pdb_text
-        result["source"] = source
-        return jsonify(result)
+        # A resubmission of the same input can reuse the client's copy of the last result: results
+        # carry an ANALYSIS_TAG_HEADER, and a request that sends back the current tag gets 204 (No
+        # Content) without running the analysis. This is app-specific rather than If-None-Match,
+        # which HTTP only answers with 304 for GET and HEAD.
+        tag = _analysis_tag(digest, source, ligand_resname, ligand_chain, engine)
+        if request.headers.get(ANALYSIS_TAG_HEADER) == tag:
+            _store_pdb_text(pdb_text, digest)  # Keep the client's pdb_ref resolvable.
+            response = app.response_class(status=204)
+        else:
+            analysis = partial(
+                _analyzer().detect_interactions,
+                pdb_text,
+                ligand_resname,
+                ligand_chain,
+                engine=engine,
+                # The atom table only feeds the heuristic engine; PLIP runs parse the text themselves.
+                atom_table=_get_atom_table(pdb_text, digest) if engine in HEURISTIC_ENGINES else None,
+            )
+            result = _analysis_result(_submit_analysis(analysis), analysis)
+            result["pdb_ref"] = _store_pdb_text(pdb_text, digest)
+            result["source"] = source
+            response = _json_response(result)
+        response.headers[ANALYSIS_TAG_HEADER] = tag
+        return response
     except ValueError as exc:
-        return jsonify({"error": str(exc)}), 400
+        return _json_response({"error": str(exc)}, 400)
+    except BrokenProcessPool:
+        return _json_response({"error": "The analysis worker stopped unexpectedly. Try again."}, 503)
     except Exception as exc:
-        return jsonify({"error": f"Unexpected error: {exc}"}), 500
+        return _json_response({"error": f"Unexpected error: {exc}"}, 500)
+
+
+@app.get("/api/pdb/<ref>")
+def pdb_file(ref: str):
+    pdb_text = None
+    # Refs are hex digests; anything else cannot name a stored file.
+    if len(ref) == 32 and ref.isascii() and ref.isalnum():
+        try:
+            with open(_pdb_text_path(ref), encoding="utf-8", newline="") as handle:
+                pdb_text = handle.read()
+        except FileNotFoundError:
+            pass
+    if pdb_text is None:
+        return _json_response({"error": "Structure is no longer available. Run the analysis again."}, 404)
+
+    response = app.response_class(pdb_text, mimetype="chemical/x-pdb")
+    # The ref is a digest of the text, so the body behind a given ref never changes.
+    response.headers["Cache-Control"] = "private, max-age=3600, immutable"
+    return response
 
 
 @app.post("/api/inspect")
 def inspect():
     try:
-        pdb_text, source = _extract_complex_text("complex", "pdb_id")
-        result = inspect_pdb_entities(pdb_text)
+        form, files = request.form, request.files
+        pdb_text, digest, source = _extract_complex_text(form, files, "complex", "pdb_id")
+        result = _analyzer().inspect_pdb_entities(pdb_text, structure=_get_structure(pdb_text, digest))
         result["source"] = source
-        return jsonify(result)
+        return _json_response(result)
     except ValueError as exc:
-        return jsonify({"error": str(exc)}), 400
+        return _json_response({"error": str(exc)}, 400)
     except Exception as exc:
-        return jsonify({"error": f"Unexpected error: {exc}"}), 500
+        return _json_response({"error": f"Unexpected error: {exc}"}, 500)
 
 
 @app.post("/api/compare")
 def compare():
     try:
-        pdb_1, source_1 = _extract_complex_text("complex_1", "pdb_id_1")
-        pdb_2, source_2 = _extract_complex_text("complex_2", "pdb_id_2")
+        form, files = request.form, request.files
+        load_1, source_1 = _resolve_complex_input(form, files, "complex_1", "pdb_id_1")
+        load_2, source_2 = _resolve_complex_input(form, files, "complex_2", "pdb_id_2")
+        ligand_resname_1 = _field(form, "ligand_resname_1", upper=True)
+        ligand_chain_1 = _field(form, "ligand_chain_1")
+        ligand_resname_2 = _field(form, "ligand_resname_2", upper=True)
+        ligand_chain_2 = _field(form, "ligand_chain_2")
+        engine = _field(form, "engine", "auto", lower=True)
+        align_structures = _field(form, "align_structures", "true", lower=True) != "false"
 
-        ligand_resname_1 = (request.form.get("ligand_resname_1") or "").strip().upper() or None
-        ligand_chain_1 = (request.form.get("ligand_chain_1") or "").strip() or None
-        ligand_resname_2 = (request.form.get("ligand_resname_2") or "").strip().upper() or None
-        ligand_chain_2 = (request.form.get("ligand_chain_2") or "").strip() or None
-        engine = (request.form.get("engine") or "auto").strip().lower() or "auto"
-        align_structures = (request.form.get("align_structures") or "true").strip().lower() != "false"
+        # Atom tables feed the heuristic engine and the superposition; PLIP parses the text itself.
+        heuristic = engine in HEURISTIC_ENGINES
+        parse_tables = heuristic or align_structures
+        # Fetch and parse both sides at once: two RCSB downloads would otherwise wait on each other.
+        future_1 = _io_pool.submit(_load_complex, load_1, parse_tables)
+        future_2 = _io_pool.submit(_load_complex, load_2, parse_tables)
+        (pdb_1, digest_1, atom_table_1), (pdb_2, digest_2, atom_table_2) = future_1.result(), future_2.result()
 
-        comparison = compare_interaction_patterns(
+        analysis = partial(
+            _analyzer().compare_interaction_patterns,
             pdb_1,
             ligand_resname_1,
             ligand_chain_1,
@@ -112,30 +591,47 @@ def compare():
             ligand_resname_2,
             ligand_chain_2,
             engine=engine,
+            atom_table_1=atom_table_1 if heuristic else None,
+            atom_table_2=atom_table_2 if heuristic else None,
         )
-        comparison["pdb_1"] = pdb_1
+        comparison_future = _submit_analysis(analysis)
+        # Superposition runs here while the analysis runs in its worker process.
+        alignment = None
+        if align_structures:
+            try:
+                alignment = _analyzer().align_structure_for_compare(
+                    pdb_text_reference=pdb_1,
+                    pdb_text_moving=pdb_2,
+                    ligand_chain_reference=ligand_chain_1,
+                    ligand_chain_moving=ligand_chain_2,
+                    atom_table_reference=atom_table_1,
+                    atom_table_moving=atom_table_2,
+                )
+            except Exception:
+                # An analysis error takes precedence, as it did when the two ran in sequence.
+                _analysis_result(comparison_future, analysis)
+                raise
+        comparison = _analysis_result(comparison_future, analysis)
+
+        comparison["pdb_ref_1"] = _store_pdb_text(pdb_1, digest_1)
         comparison["source_1"] = source_1
         comparison["source_2"] = source_2
-        if align_structures:
-            alignment = align_structure_for_compare(
-                pdb_text_reference=pdb_1,
-                pdb_text_moving=pdb_2,
-                ligand_chain_reference=ligand_chain_1,
-                ligand_chain_moving=ligand_chain_2,
-            )
-            comparison["pdb_2"] = alignment.get("aligned_pdb_text", pdb_2)
+        if alignment is not None:
+            comparison["pdb_ref_2"] = _store_pdb_text(alignment.pop("aligned_pdb_text", pdb_2))
             comparison["alignment"] = alignment
         else:
-            comparison["pdb_2"] = pdb_2
+            comparison["pdb_ref_2"] = _store_pdb_text(pdb_2, digest_2)
             comparison["alignment"] = {
                 "aligned": False,
                 "reason": "Alignment disabled by user.",
             }
-        return jsonify(comparison)
+        return _json_response(comparison)
     except ValueError as exc:
-        return jsonify({"error": str(exc)}), 400
+        return _json_response({"error": str(exc)}, 400)
+    except BrokenProcessPool:
+        return _json_response({"error": "The analysis worker stopped unexpectedly. Try again."}, 503)
     except Exception as exc:
-        return jsonify({"error": f"Unexpected error: {exc}"}), 500
+        return _json_response({"error": f"Unexpected error: {exc}"}, 500)
 
 
 if __name__ == "__main__":
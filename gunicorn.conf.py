@@ -0,0 +1,29 @@
+# Production serving: gunicorn -c gunicorn.conf.py app:app
+#
+# The app is imported once in the arbiter (preload_app) and forked into the workers, so NumPy,
+# Biopython and the analyzer's lookup tables are loaded a single time and shared copy-on-write.
+# Worker pools and caches in app.py are created lazily or are per process, which keeps the fork safe.
+import multiprocessing
+import os
+
+# One worker per core already uses every core, so each worker analyzes in its request threads
+# instead of starting its own pool of spawned processes (cores squared processes in total, each
+# re-importing NumPy and Biopython rather than sharing the preloaded copy, and pickling the atom
+# tables on every request). Export ANALYSIS_PROCESSES to override.
+os.environ.setdefault("ANALYSIS_PROCESSES", "0")
+
+bind = "0.0.0.0:5000"
+workers = multiprocessing.cpu_count()
+# A few threads per worker let RCSB downloads overlap with analysis in the same process.
+worker_class = "gthread"
+threads = 4
+preload_app = True
+# Large complexes and PLIP runs can take a while; keep the default 30s from killing them.
+timeout = 120
+
+
+def when_ready(server):
+    # app.py imports the analyzer lazily; load it in the arbiter before the workers are forked so
+    # they inherit it instead of each importing it on their first request. The import also compiles
+    # the numba kernel when numba is installed.
+    import analyzer  # noqa: F401
@@ -54,6 +54,15 @@ async function loadPdbIntoStage(stage, pdbText) {
   return component;
 }
 
+async function fetchPdbText(pdbRef) {
+  const response = await fetch(`/api/pdb/${encodeURIComponent(pdbRef)}`);
+  if (!response.ok) {
+    const data = await response.json().catch(() => ({}));
+    throw new Error(data.error || "Could not load structure for the viewer.");
+  }
+  return response.text();
+}
+
 function clearStage(stage) {
   if (!stage) return;
   stage.removeAllComponents();
@@ -464,6 +473,7 @@ async function main() {
     highlightReprs: [],
     selectedIndex: null,
   };
+  let lastAnalysis = null;
   const compareViewState1 = { component: null, highlightReprs: [] };
   const compareViewState2 = { component: null, highlightReprs: [] };
   const compareUiState = {
@@ -680,9 +690,13 @@ async function main() {
           onClick: () => {},
         }, null);
 
+        const pdbTexts = await Promise.all([
+          fetchPdbText(data.pdb_ref_1),
+          fetchPdbText(data.pdb_ref_2),
+        ]);
         const loaded = await Promise.all([
-          loadPdbIntoStage(stage1, data.pdb_1),
-          loadPdbIntoStage(stage2, data.pdb_2),
+          loadPdbIntoStage(stage1, pdbTexts[0]),
+          loadPdbIntoStage(stage2, pdbTexts[1]),
         ]);
         compareViewState1.component = loaded[0];
         compareViewState2.component = loaded[1];
@@ -782,14 +796,25 @@ async function main() {
         formData.append("engine", form.elements.engine.value || "auto");
         applyLigandSelection(formData, 1, "single");
 
-        const response = await fetch("/api/analyze", { method: "POST", body: formData });
-        const data = await response.json();
-        if (!response.ok) {
-          throw new Error(data.error || "Analysis failed");
+        // Send the last result's analysis tag; an unchanged input then comes back as 204 and the
+        // previous result is reused.
+        const headers = lastAnalysis ? { "X-Analysis-Tag": lastAnalysis.tag } : {};
+        const response = await fetch("/api/analyze", { method: "POST", body: formData, headers });
+        let data;
+        if (response.status === 204 && lastAnalysis) {
+          data = lastAnalysis.data;
+        } else {
+          data = await response.json();
+          if (!response.ok) {
+            throw new Error(data.error || "Analysis failed");
+          }
+          const tag = response.headers.get("X-Analysis-Tag");
+          lastAnalysis = tag ? { tag, data } : null;
         }
 
         setSingleModeVisible();
-        singleViewState.component = await loadPdbIntoStage(stage1, data.pdb);
+        const pdbText = await fetchPdbText(data.pdb_ref);
+        singleViewState.component = await loadPdbIntoStage(stage1, pdbText);
         clearStage(stage2);
         compareViewState1.component = null;
         compareViewState2.component = null;
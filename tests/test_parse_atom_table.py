@@ -0,0 +1,142 @@
+import unittest
+
+import numpy as np
+
+from analyzer import parse_atom_table, parse_structure
+
+
+def _atom(serial, name, resname, resseq, x, *, altloc=" ", occupancy=1.0, chain="A", element="C", record="ATOM"):
+    return (
+        f"{record:<6}{serial:5d} {name:<4}{altloc}{resname:>3} {chain}{resseq:4d}    "
+        f"{x:8.3f}{1.0:8.3f}{2.0:8.3f}{occupancy:6.2f}{20.0:6.2f}          {element:>2}"
+    )
+
+
+def _biopython_residues(pdb_text):
+    residues = []
+    for residue in parse_structure(pdb_text).get_residues():
+        chain = residue.get_parent()
+        het, resseq, icode = residue.id
+        residues.append(
+            (
+                chain.get_parent().id,
+                chain.id,
+                het != " ",
+                resseq,
+                icode,
+                residue.resname.strip(),
+                [(atom.get_id(), tuple(atom.coord.tolist())) for atom in residue],
+            )
+        )
+    return residues
+
+
+def _table_residues(pdb_text):
+    table = parse_atom_table(pdb_text)
+    residues = []
+    for k in range(len(table["res_resname"])):
+        atoms = range(table["res_start"][k], table["res_start"][k + 1])
+        residues.append(
+            (
+                int(table["res_model"][k]),
+                str(table["res_chain"][k]),
+                bool(table["res_het"][k]),
+                int(table["res_resseq"][k]),
+                str(table["res_icode"][k]),
+                str(table["res_resname"][k]),
+                [(str(table["atom_name"][i]), tuple(table["xyz"][i].tolist())) for i in atoms],
+            )
+        )
+    return residues
+
+
+ALTLOC = "\n".join(
+    [
+        _atom(1, " N  ", "SER", 1, 0.0),
+        _atom(2, " CA ", "SER", 1, 1.0, altloc="A", occupancy=0.4),
+        _atom(3, " CA ", "SER", 1, 1.5, altloc="B", occupancy=0.6),
+        _atom(4, " OG ", "SER", 1, 2.0, altloc="A", occupancy=0.5, element="O"),
+        _atom(5, " OG ", "SER", 1, 2.5, altloc="B", occupancy=0.5, element="O"),
+        _atom(6, " N  ", "ALA", 2, 3.0),
+        _atom(7, " CB ", "ALA", 2, 4.0, altloc="B", occupancy=0.3),
+        _atom(8, " CB ", "ALA", 2, 4.5, altloc="A", occupancy=0.7),
+        _atom(9, " C1 ", "LIG", 900, 9.0, chain="B", record="HETATM"),
+        "END",
+    ]
+)
+
+MULTI_MODEL = "\n".join(
+    [
+        "HEADER    MULTI MODEL",
+        "MODEL        1",
+        _atom(1, " N  ", "GLY", 1, 0.0, chain="B"),
+        _atom(2, " CA ", "GLY", 1, 1.0, chain="B"),
+        _atom(3, " N  ", "ALA", 5, 2.0),
+        _atom(4, " O  ", "HOH", 501, 3.0, element="O", record="HETATM"),
+        "ENDMDL",
+        "MODEL        2",
+        _atom(1, " N  ", "ALA", 5, 4.0),
+        _atom(2, " N  ", "GLY", 1, 5.0, chain="B"),
+        _atom(3, " CA ", "GLY", 1, 6.0, chain="B"),
+        "ENDMDL",
+        _atom(4, " N  ", "GLY", 7, 7.0),
+        "CONECT    1    2",
+        _atom(5, " N  ", "GLY", 8, 8.0),
+    ]
+)
+
+POINT_MUTATION = "\n".join(
+    [
+        _atom(1, " N  ", "GLY", 1, 0.0),
+        _atom(2, " CA ", "GLY", 1, 1.0),
+        _atom(3, " N  ", "SER", 2, 2.0, altloc="A", occupancy=0.5),
+        _atom(4, " CA ", "SER", 2, 3.0, altloc="A", occupancy=0.5),
+        _atom(5, " OG ", "SER", 2, 4.0, altloc="A", occupancy=0.5, element="O"),
+        _atom(6, " N  ", "THR", 2, 2.1, altloc="B", occupancy=0.5),
+        _atom(7, " CA ", "THR", 2, 3.1, altloc="B", occupancy=0.5),
+        _atom(8, " OG1", "THR", 2, 4.1, altloc="B", occupancy=0.5, element="O"),
+        _atom(9, " N  ", "ALA", 3, 5.0),
+        # Interleaved variants: the last run (VAL) is the one PDBParser selects.
+        _atom(10, " N  ", "ILE", 4, 6.0, altloc="A", occupancy=0.5),
+        _atom(11, " N  ", "VAL", 4, 6.1, altloc="B", occupancy=0.5),
+        _atom(12, " N  ", "ILE", 4, 6.2, altloc="A", occupancy=0.5),
+        _atom(13, " CA ", "VAL", 4, 7.0, altloc="B", occupancy=0.5),
+        _atom(14, " N  ", "LEU", 5, 8.0),
+        # First variant without altlocs: PDBParser keeps it and drops the second.
+        _atom(15, " N  ", "ASP", 6, 9.0),
+        _atom(16, " N  ", "ASN", 6, 9.1, altloc="B", occupancy=0.5),
+        _atom(17, " N  ", "LYS", 7, 10.0),
+        "END",
+    ]
+)
+
+
+class ParseAtomTableMatchesPDBParserTest(unittest.TestCase):
+    def assert_matches_pdbparser(self, pdb_text):
+        self.assertEqual(_table_residues(pdb_text), _biopython_residues(pdb_text))
+
+    def test_alternate_locations(self):
+        self.assert_matches_pdbparser(ALTLOC)
+
+    def test_multiple_models(self):
+        self.assert_matches_pdbparser(MULTI_MODEL)
+
+    def test_point_mutations(self):
+        self.assert_matches_pdbparser(POINT_MUTATION)
+
+    def test_point_mutation_keeps_selected_variant_only(self):
+        table = parse_atom_table(POINT_MUTATION)
+        chain_a = table["res_chain"] == "A"
+        residues = list(zip(table["res_resname"][chain_a].tolist(), table["res_resseq"][chain_a].tolist()))
+        self.assertNotIn(("SER", 2), residues)
+        self.assertIn(("THR", 2), residues)
+        self.assertEqual(len(residues), len(set(resseq for _, resseq in residues)))
+
+    def test_empty_input(self):
+        table = parse_atom_table("HEADER    NOTHING\nEND\n")
+        self.assertEqual(len(table["xyz"]), 0)
+        np.testing.assert_array_equal(table["chain_res_start"], [0])
+
+
+if __name__ == "__main__":
+    unittest.main()